@@ -0,0 +1,134 @@
+"""Measure import-to-first-response start-up time for VoiceExpress.
+
+Each trial runs in a fresh interpreter that imports the package, builds
+the app and serves ``/`` through the test client, timing the whole span.
+Trials alternate between building the catalog in Python and restoring it
+from a catalog snapshot.
+
+The demo catalog has only a handful of artifacts, too few for a snapshot
+to pay off. ``--artifacts N`` grows it to ``N`` synthetic artifacts, with
+varied tags and authors, so both modes can be compared at a realistic
+size; the catalog build is counted in the ``create_app`` column.
+
+    python benchmarks/startup.py [--trials N] [--artifacts N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Grows the demo catalog to ``count`` artifacts by copying its entries.
+GROW = """
+def grow_catalog(count):
+    from dataclasses import replace
+    from voiceexpress import data
+    data.seed_catalog()
+    templates = list(data.ARTIFACTS)
+    next_id = max(artifact.id for artifact in templates) + 1
+    for offset in range(count - len(templates)):
+        template = templates[offset % len(templates)]
+        data.ARTIFACTS.append(
+            replace(
+                template,
+                id=next_id + offset,
+                title=f"{template.title} #{offset}",
+                byline=f"By Contributor {offset % 500}",
+                tags=[*template.tags, f"topic-{offset % 1000}"],
+                citations=list(template.citations),
+            )
+        )
+    data.bump_catalog_version()
+"""
+
+CHILD = GROW + """
+import os
+import time
+started = time.perf_counter()
+from voiceexpress import create_app
+imported = time.perf_counter()
+artifacts = int(os.environ.get("BENCH_ARTIFACTS", "0"))
+if artifacts and not os.environ.get("VOICEEXPRESS_SNAPSHOT"):
+    grow_catalog(artifacts)
+app = create_app()
+created = time.perf_counter()
+response = app.test_client().get("/")
+assert response.status_code == 200, response.status_code
+finished = time.perf_counter()
+print(imported - started, created - imported, finished - created, finished - started)
+"""
+
+
+def _run_once(env: dict) -> list:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return [float(value) for value in output.split()]
+
+
+def _report(label: str, timings: list) -> None:
+    columns = list(zip(*timings))
+    medians = [statistics.median(column) * 1000 for column in columns]
+    print(
+        f"{label:<10} import {medians[0]:7.1f} ms  create_app {medians[1]:6.1f} ms  "
+        f"first response {medians[2]:6.1f} ms  total {medians[3]:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=15)
+    parser.add_argument(
+        "--artifacts", type=int, default=0, help="synthetic catalog size (default: demo catalog)"
+    )
+    args = parser.parse_args()
+
+    builtin_env = dict(os.environ, PYTHONPATH=ROOT, BENCH_ARTIFACTS=str(args.artifacts))
+    builtin_env.pop("VOICEEXPRESS_SNAPSHOT", None)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "catalog.snap")
+        writer = GROW + (
+            "import sys\n"
+            "from voiceexpress import data\n"
+            "from voiceexpress.snapshot import write_snapshot\n"
+            "grow_catalog(int(sys.argv[2])) if int(sys.argv[2]) else data.seed_catalog()\n"
+            "write_snapshot(sys.argv[1])\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", writer, path, str(args.artifacts)],
+            cwd=ROOT,
+            env=builtin_env,
+            check=True,
+        )
+        snapshot_env = dict(builtin_env, VOICEEXPRESS_SNAPSHOT=path)
+        print(
+            f"catalog {args.artifacts or 'demo'} artifacts, "
+            f"snapshot size {os.path.getsize(path)} bytes"
+        )
+
+        # Warm the bytecode caches, then alternate modes so drift in machine
+        # load affects both equally.
+        _run_once(builtin_env)
+        _run_once(snapshot_env)
+        builtin, snapshot = [], []
+        for _ in range(args.trials):
+            builtin.append(_run_once(builtin_env))
+            snapshot.append(_run_once(snapshot_env))
+
+    _report("built-in", builtin)
+    _report("snapshot", snapshot)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,65 @@
 """VoiceExpress Flask application factory."""
 from __future__ import annotations
 
+import os
+
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
 
+from .cache import FragmentCacheExtension
+from .data import ARTIFACTS, seed_catalog
 from .routes import public_bp
 from .auth import auth_bp
 from .admin import admin_bp
 from .api import api_bp
+from .feeds import feeds_bp
+from .images import images_bp, init_images
+from .jobs import jobs
+from .throttle import admission
 
 
 def create_app() -> Flask:
     """Create and configure the VoiceExpress Flask app."""
     app = Flask(__name__)
     app.config["SECRET_KEY"] = "voiceexpress-secret"
+    app.config["JINJA_BYTECODE_CACHE_DIR"] = os.path.join(app.instance_path, "jinja-cache")
+    app.config["CATALOG_SNAPSHOT"] = os.environ.get("VOICEEXPRESS_SNAPSHOT", "")
+    app.config["FEEDS_MAX_AGE"] = 300
+    app.config["FEEDS_BASE_URL"] = os.environ.get("VOICEEXPRESS_BASE_URL", "")
+    app.config["SINGLE_FLIGHT"] = {"public", "api"}
+    app.config["ADMISSION_LIMITS"] = {
+        "public": {"rate": 5.0, "burst": 20},
+        "api": {"rate": 5.0, "burst": 20},
+    }
+
+    if app.config["CATALOG_SNAPSHOT"] and os.path.exists(app.config["CATALOG_SNAPSHOT"]):
+        from .snapshot import load_snapshot
+
+        load_snapshot(app.config["CATALOG_SNAPSHOT"])
+    elif not ARTIFACTS:
+        seed_catalog()
+
+    os.makedirs(app.config["JINJA_BYTECODE_CACHE_DIR"], exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(app.config["JINJA_BYTECODE_CACHE_DIR"]),
+        "extensions": [*app.jinja_options.get("extensions", ()), FragmentCacheExtension],
+    }
+
+    if not app.config["FEEDS_BASE_URL"]:
+        app.logger.warning(
+            "VOICEEXPRESS_BASE_URL is not set; feeds are only served in debug mode."
+        )
+
+    jobs.init_app(app)
+    admission.init_app(app)
+    init_images(app)
 
     app.register_blueprint(public_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(api_bp)
+    app.register_blueprint(feeds_bp)
+    app.register_blueprint(images_bp)
 
     return app
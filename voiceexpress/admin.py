@@ -3,9 +3,28 @@ from __future__ import annotations
 
 from datetime import date
 
-from flask import Blueprint, redirect, render_template, request, session, url_for
-
-from .data import ARTIFACTS, CATEGORIES, TAGS, USERS, Artifact, Citation
+from flask import (
+    Blueprint,
+    current_app,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+
+from .data import (
+    ARTIFACTS,
+    CATEGORIES,
+    TAGS,
+    USERS,
+    Artifact,
+    Citation,
+    bump_catalog_version,
+    warm_indexes,
+)
+from .jobs import jobs
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -15,6 +34,30 @@ def _is_editor() -> bool:
     return bool(user_name and USERS.get(user_name) and USERS[user_name].role in {"Editor", "Admin"})
 
 
+def _catalog_changed() -> None:
+    """Invalidate catalog-derived caches and queue their rebuild."""
+    bump_catalog_version()
+    jobs.enqueue("catalog.indexes")
+    jobs.enqueue("catalog.snapshot")
+    jobs.enqueue("feeds.render")
+
+
+@jobs.task("catalog.indexes")
+def rebuild_indexes(payload) -> None:
+    """Rebuild lookup indexes so the next reader does not pay for the scan."""
+    warm_indexes()
+
+
+@jobs.task("catalog.snapshot")
+def write_catalog_snapshot(payload) -> None:
+    """Persist the edited catalog so new workers boot from it."""
+    path = current_app.config["CATALOG_SNAPSHOT"]
+    if path:
+        from .snapshot import write_snapshot
+
+        write_snapshot(path)
+
+
 @admin_bp.route("/")
 def dashboard() -> str:
     """Render the editorial dashboard with creator modes."""
@@ -58,6 +101,11 @@ def create_artifact() -> str:
             abstract_tag=request.form.get("abstract_tag", "Unnamed Orbit"),
         )
         ARTIFACTS.append(artifact)
+        _catalog_changed()
+        jobs.enqueue("images.derive", key=artifact.image, payload={"sources": [artifact.image]})
+        jobs.enqueue(
+            "exports.render", key=str(artifact.id), payload={"artifact_id": artifact.id}
+        )
         message = "Artifact created and routed to editorial review."
 
     return render_template(
@@ -77,6 +125,7 @@ def manage_tags() -> str:
         tag = request.form.get("tag", "").strip()
         if tag and tag not in TAGS:
             TAGS.append(tag)
+            _catalog_changed()
     return render_template("admin/tags.html", tags=TAGS)
 
 
@@ -89,4 +138,13 @@ def manage_categories() -> str:
         category = request.form.get("category", "").strip()
         if category and category not in CATEGORIES:
             CATEGORIES.append(category)
+            _catalog_changed()
     return render_template("admin/categories.html", categories=CATEGORIES)
+
+
+@admin_bp.route("/jobs")
+def job_metrics():
+    """Report background job counters and queue depth."""
+    if not _is_editor():
+        return redirect(url_for("auth.login"))
+    return jsonify(jobs.metrics())
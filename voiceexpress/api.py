@@ -2,57 +2,116 @@
 from __future__ import annotations
 
 import json
-from typing import Dict
+from typing import Callable, Dict, Tuple
 
-from flask import Blueprint, Response
+from flask import Blueprint, Response, abort, request
 
-from .data import ARTIFACTS, find_artifact
+from .cache import VersionedCache
+from .data import ARTIFACTS, Artifact, find_artifact
+from .jobs import jobs
+from .throttle import admission_controlled, single_flight
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
 
-def _artifact_payload(artifact) -> Dict[str, object]:
-    return {
-        "id": artifact.id,
-        "title": artifact.title,
-        "tagline": artifact.tagline,
-        "synopsis": artifact.synopsis,
-        "byline": artifact.byline,
-        "author_note": artifact.author_note,
-        "editor_note": artifact.editor_note,
-        "body": artifact.body,
-        "category": artifact.category,
-        "tags": artifact.tags,
-        "location": artifact.location,
-        "published": artifact.published.isoformat(),
-        "citations": [citation.__dict__ for citation in artifact.citations],
-        "artifact_type": artifact.artifact_type,
-        "issue": artifact.issue,
-        "geotag": artifact.geotag,
-        "abstract_tag": artifact.abstract_tag,
-    }
+_FIELD_GETTERS: Dict[str, Callable[[Artifact], object]] = {
+    "id": lambda artifact: artifact.id,
+    "title": lambda artifact: artifact.title,
+    "tagline": lambda artifact: artifact.tagline,
+    "synopsis": lambda artifact: artifact.synopsis,
+    "byline": lambda artifact: artifact.byline,
+    "author_note": lambda artifact: artifact.author_note,
+    "editor_note": lambda artifact: artifact.editor_note,
+    "body": lambda artifact: artifact.body,
+    "category": lambda artifact: artifact.category,
+    "tags": lambda artifact: artifact.tags,
+    "location": lambda artifact: artifact.location,
+    "published": lambda artifact: artifact.published.isoformat(),
+    "citations": lambda artifact: [citation.__dict__ for citation in artifact.citations],
+    "artifact_type": lambda artifact: artifact.artifact_type,
+    "issue": lambda artifact: artifact.issue,
+    "geotag": lambda artifact: artifact.geotag,
+    "abstract_tag": lambda artifact: artifact.abstract_tag,
+}
+ARTIFACT_FIELDS = tuple(_FIELD_GETTERS)
+
+MAX_BATCH_IDS = 100
+
+
+def _artifact_payload(artifact, fields: Tuple[str, ...] = ARTIFACT_FIELDS) -> Dict[str, object]:
+    return {name: _FIELD_GETTERS[name](artifact) for name in fields}
+
+
+def _requested_fields() -> Tuple[str, ...]:
+    """Parse ``?fields=a,b`` into payload fields, in canonical order."""
+    if "fields" not in request.args:
+        return ARTIFACT_FIELDS
+    raw = request.args["fields"]
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    if not requested:
+        abort(Response("fields must name at least one field", status=400))
+    unknown = sorted(requested - set(ARTIFACT_FIELDS))
+    if unknown:
+        abort(Response(f"Unknown fields: {', '.join(unknown)}", status=400))
+    return tuple(name for name in ARTIFACT_FIELDS if name in requested)
+
+
+def _json_response(payload: object) -> Response:
+    return Response(json.dumps(payload, indent=2), mimetype="application/json")
 
 
 @api_bp.route("/artifacts")
+@admission_controlled
 def artifacts_feed() -> Response:
-    """Return a JSON feed for all artifacts."""
-    payload = [_artifact_payload(artifact) for artifact in ARTIFACTS]
-    return Response(json.dumps(payload, indent=2), mimetype="application/json")
+    """Return a JSON feed for all artifacts, optionally limited to ``?fields=``."""
+    fields = _requested_fields()
+    body = single_flight(
+        ("artifacts", fields),
+        lambda: json.dumps(
+            [_artifact_payload(artifact, fields) for artifact in ARTIFACTS], indent=2
+        ),
+    )
+    return Response(body, mimetype="application/json")
 
 
-@api_bp.route("/export/<int:artifact_id>.<format>")
-def export_artifact(artifact_id: int, format: str) -> Response:
-    """Export artifacts as JSON, XML, or Markdown."""
-    artifact = find_artifact(artifact_id)
-    if not artifact:
-        return Response("Not found", status=404)
+@api_bp.route("/artifacts/batch")
+def artifacts_batch() -> Response:
+    """Return the artifacts listed in ``?ids=1,2,3`` in the order requested."""
+    fields = _requested_fields()
+    try:
+        ids = [int(value) for value in request.args.get("ids", "").split(",") if value.strip()]
+    except ValueError:
+        return Response("ids must be a comma-separated list of integers", status=400)
+    if not ids:
+        return Response("ids is required", status=400)
+    if len(ids) > MAX_BATCH_IDS:
+        return Response(f"At most {MAX_BATCH_IDS} ids per batch", status=400)
+
+    artifacts = []
+    missing = []
+    for artifact_id in dict.fromkeys(ids):
+        artifact = find_artifact(artifact_id)
+        if artifact:
+            artifacts.append(_artifact_payload(artifact, fields))
+        else:
+            missing.append(artifact_id)
+    return _json_response({"artifacts": artifacts, "missing": missing})
+
+
+EXPORT_MIMETYPES = {
+    "json": "application/json",
+    "md": "text/markdown",
+    "xml": "application/xml",
+}
+
+_export_cache: VersionedCache[str] = VersionedCache()
+
+
+def _render_export(artifact, format: str) -> str:
     if format == "json":
-        return Response(
-            json.dumps(_artifact_payload(artifact), indent=2),
-            mimetype="application/json",
-        )
+        return json.dumps(_artifact_payload(artifact), indent=2)
     if format == "md":
-        markdown = (
+        return (
             f"# {artifact.title}\n\n"
             f"*{artifact.tagline}*\n\n"
             f"{artifact.byline} | {artifact.location} | {artifact.published.isoformat()}\n\n"
@@ -60,22 +119,50 @@ def export_artifact(artifact_id: int, format: str) -> Response:
             f"## Body\n{artifact.body}\n\n"
             f"## Notes\nAuthor: {artifact.author_note}\nEditor: {artifact.editor_note}\n"
         )
-        return Response(markdown, mimetype="text/markdown")
-    if format == "xml":
-        citations_xml = "".join(
-            f"<citation label=\"{citation.label}\" source=\"{citation.source}\" url=\"{citation.url}\" />"
-            for citation in artifact.citations
-        )
-        xml = (
-            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-            f"<artifact id=\"{artifact.id}\">"
-            f"<title>{artifact.title}</title>"
-            f"<tagline>{artifact.tagline}</tagline>"
-            f"<synopsis>{artifact.synopsis}</synopsis>"
-            f"<byline>{artifact.byline}</byline>"
-            f"<body>{artifact.body}</body>"
-            f"<citations>{citations_xml}</citations>"
-            "</artifact>"
-        )
-        return Response(xml, mimetype="application/xml")
-    return Response("Unsupported format", status=400)
+    citations_xml = "".join(
+        f"<citation label=\"{citation.label}\" source=\"{citation.source}\" url=\"{citation.url}\" />"
+        for citation in artifact.citations
+    )
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        f"<artifact id=\"{artifact.id}\">"
+        f"<title>{artifact.title}</title>"
+        f"<tagline>{artifact.tagline}</tagline>"
+        f"<synopsis>{artifact.synopsis}</synopsis>"
+        f"<byline>{artifact.byline}</byline>"
+        f"<body>{artifact.body}</body>"
+        f"<citations>{citations_xml}</citations>"
+        "</artifact>"
+    )
+
+
+def _cached_export(artifact, format: str) -> str:
+    return _export_cache.get_or_render(
+        (artifact.id, format), lambda: _render_export(artifact, format)
+    )
+
+
+@api_bp.route("/export/<int:artifact_id>.<format>")
+def export_artifact(artifact_id: int, format: str) -> Response:
+    """Export artifacts as JSON, XML, or Markdown.
+
+    JSON exports honour ``?fields=``; Markdown and XML are full documents.
+    Full exports are cached per catalog version.
+    """
+    artifact = find_artifact(artifact_id)
+    if not artifact:
+        return Response("Not found", status=404)
+    if format not in EXPORT_MIMETYPES:
+        return Response("Unsupported format", status=400)
+    if format == "json" and "fields" in request.args:
+        return _json_response(_artifact_payload(artifact, _requested_fields()))
+    return Response(_cached_export(artifact, format), mimetype=EXPORT_MIMETYPES[format])
+
+
+@jobs.task("exports.render")
+def prerender_exports(payload) -> None:
+    """Render every export format of a published artifact ahead of the first download."""
+    artifact = find_artifact(payload["artifact_id"])
+    if artifact:
+        for format in EXPORT_MIMETYPES:
+            _cached_export(artifact, format)
@@ -0,0 +1,75 @@
+"""Catalog-versioned caching for VoiceExpress.
+
+Shared layout pieces such as the sidebars, and other renders derived from
+the catalog, only change when editors touch the catalog, so they are built
+once per catalog version and reused.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Generic, Hashable, TypeVar
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from .data import catalog_version
+
+
+T = TypeVar("T")
+
+
+class VersionedCache(Generic[T]):
+    """Values keyed by an arbitrary key, dropped when the catalog version changes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = catalog_version()
+        self._values: Dict[Hashable, T] = {}
+
+    def get_or_render(self, key: Hashable, render: Callable[[], T]) -> T:
+        version = catalog_version()
+        with self._lock:
+            if version != self._version:
+                self._values.clear()
+                self._version = version
+            cached = self._values.get(key)
+        if cached is not None:
+            return cached
+        rendered = render()
+        with self._lock:
+            if version == self._version:
+                self._values[key] = rendered
+        return rendered
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class FragmentCacheExtension(Extension):
+    """Adds ``{% cache "name" %}...{% endcache %}`` to the template language.
+
+    Extra arguments after the name become part of the key, e.g.
+    ``{% cache "sidebar", locale %}``.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment) -> None:
+        super().__init__(environment)
+        environment.extend(fragment_cache=VersionedCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_render_cached", [nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_cached(self, key, caller) -> str:
+        return self.environment.fragment_cache.get_or_render(
+            tuple(str(part) for part in key), caller
+        )
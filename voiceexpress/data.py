@@ -4,12 +4,16 @@ This module intentionally provides a fully working, no-stub
 implementation that demonstrates how the platform behaves before
 persistence is added. Each artifact type is represented with
 rich metadata to reflect editorial provenance and print culture.
+
+The catalog containers start empty; ``create_app`` fills them either from
+a catalog snapshot or from :func:`seed_catalog`.
 """
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -97,221 +101,353 @@ USERS: Dict[str, User] = {
     "archive": User(nickname="archive", password="ledger", role="Archivist"),
 }
 
-CATEGORIES = ["Routes", "Investigations", "Letters", "Photojournalism", "Zines", "Library"]
-TAGS = ["rail", "labor", "migration", "signals", "archives", "darkroom", "cartography"]
-
-ARTIFACTS: List[Artifact] = [
-    Artifact(
-        id=1,
-        title="Signals From the Night Line",
-        tagline="Truth takes time, even in motion",
-        synopsis="An overnight run that reveals the hidden economy of the rails.",
-        byline="By Sol Lane",
-        author_note="Compiled over six monthly runs between stations.",
-        editor_note="Verified against maintenance logs and dispatcher notes.",
-        body=(
-            "The freight corridor wakes after midnight, when the city exhales. "
-            "We boarded the maintenance car with a ledger of delays and a promise "
-            "from the yard chief. What follows is a report on how silence is engineered."
+CATEGORIES: List[str] = []
+TAGS: List[str] = []
+ARTIFACTS: List[Artifact] = []
+REPORTS: Dict[int, Report] = {}
+PHOTO_ESSAYS: Dict[int, PhotoEssay] = {}
+LETTERS: Dict[int, Letter] = {}
+ZINES: Dict[int, Zine] = {}
+ISSUES: List[Issue] = []
+COLLECTIONS: Dict[str, Collection] = {}
+
+
+def seed_catalog() -> None:
+    """Fill the catalog with the built-in editorial sample.
+
+    Runs only when no catalog snapshot is configured, so workers booting
+    from a snapshot never build this copy.
+    """
+    CATEGORIES[:] = ["Routes", "Investigations", "Letters", "Photojournalism", "Zines", "Library"]
+    TAGS[:] = ["rail", "labor", "migration", "signals", "archives", "darkroom", "cartography"]
+
+    ARTIFACTS[:] = [
+        Artifact(
+            id=1,
+            title="Signals From the Night Line",
+            tagline="Truth takes time, even in motion",
+            synopsis="An overnight run that reveals the hidden economy of the rails.",
+            byline="By Sol Lane",
+            author_note="Compiled over six monthly runs between stations.",
+            editor_note="Verified against maintenance logs and dispatcher notes.",
+            body=(
+                "The freight corridor wakes after midnight, when the city exhales. "
+                "We boarded the maintenance car with a ledger of delays and a promise "
+                "from the yard chief. What follows is a report on how silence is engineered."
+            ),
+            category="Investigations",
+            tags=["rail", "labor", "signals"],
+            location="North Yard",
+            published=date(2024, 6, 1),
+            citations=[
+                Citation("Dispatch Log 44", "North Yard Operations", "https://example.com/logs/44"),
+                Citation("Union Memo", "Signal Workers Guild", "https://example.com/memo"),
+            ],
+            artifact_type="report",
+            image="/static/images/placeholder.svg",
+            issue="June 2024",
+            geotag="41.8781,-87.6298",
+            abstract_tag="Exo-Station Atlas #12",
         ),
-        category="Investigations",
-        tags=["rail", "labor", "signals"],
-        location="North Yard",
-        published=date(2024, 6, 1),
-        citations=[
-            Citation("Dispatch Log 44", "North Yard Operations", "https://example.com/logs/44"),
-            Citation("Union Memo", "Signal Workers Guild", "https://example.com/memo"),
-        ],
-        artifact_type="report",
-        image="/static/images/placeholder.svg",
-        issue="June 2024",
-        geotag="41.8781,-87.6298",
-        abstract_tag="Exo-Station Atlas #12",
-    ),
-    Artifact(
-        id=2,
-        title="Cartographers of Delay",
-        tagline="A mapping of stalled departures",
-        synopsis="Dispatchers chart how time bends across the corridor.",
-        byline="By Mira Quill",
-        author_note="Maps drawn from 1,200 delay slips.",
-        editor_note="Includes archival comparisons from 1998-2010.",
-        body=(
-            "Delay maps are the quiet literature of a rail system. "
-            "Each mark is a narrative about weather, staffing, and the patient "
-            "work of signal crews."
+        Artifact(
+            id=2,
+            title="Cartographers of Delay",
+            tagline="A mapping of stalled departures",
+            synopsis="Dispatchers chart how time bends across the corridor.",
+            byline="By Mira Quill",
+            author_note="Maps drawn from 1,200 delay slips.",
+            editor_note="Includes archival comparisons from 1998-2010.",
+            body=(
+                "Delay maps are the quiet literature of a rail system. "
+                "Each mark is a narrative about weather, staffing, and the patient "
+                "work of signal crews."
+            ),
+            category="Routes",
+            tags=["cartography", "archives"],
+            location="Union Terminal",
+            published=date(2024, 6, 3),
+            citations=[
+                Citation("Delay Ledger", "Union Terminal", "https://example.com/ledger"),
+            ],
+            artifact_type="article",
+            image="/static/images/placeholder.svg",
+            issue="June 2024",
+            geotag="34.0522,-118.2437",
+            abstract_tag="Lunar Yard 3B",
         ),
-        category="Routes",
-        tags=["cartography", "archives"],
-        location="Union Terminal",
-        published=date(2024, 6, 3),
-        citations=[
-            Citation("Delay Ledger", "Union Terminal", "https://example.com/ledger"),
-        ],
-        artifact_type="article",
-        image="/static/images/placeholder.svg",
-        issue="June 2024",
-        geotag="34.0522,-118.2437",
-        abstract_tag="Lunar Yard 3B",
-    ),
-    Artifact(
-        id=3,
-        title="Letters from the Switch House",
-        tagline="A note on responsibility",
-        synopsis="A letter written between shifts.",
-        byline="By The Stationmaster",
-        author_note="Written after the June signal outage.",
-        editor_note="Published in full without edits.",
-        body=(
-            "We are taught to listen for the relay clicks, a language of arrival and delay. "
-            "This is a letter to the apprentices who will inherit the board."
+        Artifact(
+            id=3,
+            title="Letters from the Switch House",
+            tagline="A note on responsibility",
+            synopsis="A letter written between shifts.",
+            byline="By The Stationmaster",
+            author_note="Written after the June signal outage.",
+            editor_note="Published in full without edits.",
+            body=(
+                "We are taught to listen for the relay clicks, a language of arrival and delay. "
+                "This is a letter to the apprentices who will inherit the board."
+            ),
+            category="Letters",
+            tags=["signals", "labor"],
+            location="Switch House",
+            published=date(2024, 6, 5),
+            citations=[
+                Citation("Switch Training Guide", "Rail Authority", "https://example.com/guide"),
+            ],
+            artifact_type="letter",
+            image="/static/images/placeholder.svg",
+            issue="June 2024",
+            geotag="40.7128,-74.0060",
+            abstract_tag="Outer Relay Point",
         ),
-        category="Letters",
-        tags=["signals", "labor"],
-        location="Switch House",
-        published=date(2024, 6, 5),
-        citations=[
-            Citation("Switch Training Guide", "Rail Authority", "https://example.com/guide"),
-        ],
-        artifact_type="letter",
-        image="/static/images/placeholder.svg",
-        issue="June 2024",
-        geotag="40.7128,-74.0060",
-        abstract_tag="Outer Relay Point",
-    ),
-    Artifact(
-        id=4,
-        title="Darkroom Frequency",
-        tagline="Frames exposed between stations",
-        synopsis="A photographic sequence from the midnight run.",
-        byline="By Imani Rue",
-        author_note="Shot on 35mm, scanned in the yard lab.",
-        editor_note="Sequence reflects original contact sheet order.",
-        body=(
-            "Each frame captures the interval between signals. "
-            "Photojournalism here is a ledger of light."
+        Artifact(
+            id=4,
+            title="Darkroom Frequency",
+            tagline="Frames exposed between stations",
+            synopsis="A photographic sequence from the midnight run.",
+            byline="By Imani Rue",
+            author_note="Shot on 35mm, scanned in the yard lab.",
+            editor_note="Sequence reflects original contact sheet order.",
+            body=(
+                "Each frame captures the interval between signals. "
+                "Photojournalism here is a ledger of light."
+            ),
+            category="Photojournalism",
+            tags=["darkroom"],
+            location="South Spur",
+            published=date(2024, 6, 8),
+            citations=[
+                Citation("Film Stock Notes", "Yard Lab", "https://example.com/film"),
+            ],
+            artifact_type="photo",
+            image="/static/images/placeholder.svg",
+            issue="June 2024",
+            geotag="47.6062,-122.3321",
+            abstract_tag="Dust Belt 19",
         ),
-        category="Photojournalism",
-        tags=["darkroom"],
-        location="South Spur",
-        published=date(2024, 6, 8),
-        citations=[
-            Citation("Film Stock Notes", "Yard Lab", "https://example.com/film"),
-        ],
-        artifact_type="photo",
-        image="/static/images/placeholder.svg",
-        issue="June 2024",
-        geotag="47.6062,-122.3321",
-        abstract_tag="Dust Belt 19",
-    ),
-    Artifact(
-        id=5,
-        title="Matchbox Zine: The Signal Fold",
-        tagline="A portable archive",
-        synopsis="Folded spreads on signal lore.",
-        byline="By K. West",
-        author_note="Designed for pocket print.",
-        editor_note="Includes fold instructions.",
-        body="A zine built for the palm, carrying signal stories.",
-        category="Zines",
-        tags=["archives"],
-        location="Print Room",
-        published=date(2024, 6, 10),
-        citations=[
-            Citation("Fold Patterns", "Print Room", "https://example.com/fold"),
-        ],
-        artifact_type="zine",
-        image="/static/images/placeholder.svg",
-        issue="June 2024",
-        geotag="51.5074,-0.1278",
-        abstract_tag="Orbit Shelf A",
-    ),
-]
-
-REPORTS: Dict[int, Report] = {
-    1: Report(
-        artifact=ARTIFACTS[0],
-        annotations=[
-            "Annotation: Signal lag at mile 22 traced to weathered relay housing.",
-            "Annotation: Union memo corroborates staffing gaps in night shifts.",
-        ],
-        sources=["Union memo", "Maintenance log", "Dispatch interview"],
-    )
-}
+        Artifact(
+            id=5,
+            title="Matchbox Zine: The Signal Fold",
+            tagline="A portable archive",
+            synopsis="Folded spreads on signal lore.",
+            byline="By K. West",
+            author_note="Designed for pocket print.",
+            editor_note="Includes fold instructions.",
+            body="A zine built for the palm, carrying signal stories.",
+            category="Zines",
+            tags=["archives"],
+            location="Print Room",
+            published=date(2024, 6, 10),
+            citations=[
+                Citation("Fold Patterns", "Print Room", "https://example.com/fold"),
+            ],
+            artifact_type="zine",
+            image="/static/images/placeholder.svg",
+            issue="June 2024",
+            geotag="51.5074,-0.1278",
+            abstract_tag="Orbit Shelf A",
+        ),
+    ]
 
-PHOTO_ESSAYS: Dict[int, PhotoEssay] = {
-    4: PhotoEssay(
-        artifact=ARTIFACTS[3],
-        frames=[
-            "/static/images/placeholder.svg",
-            "/static/images/placeholder.svg",
-            "/static/images/placeholder.svg",
-        ],
-        captions=[
-            "Frame 01: Night signal in fog.",
-            "Frame 02: Yard crew under sodium lights.",
-            "Frame 03: Rails after rain.",
-        ],
-    )
-}
+    REPORTS.clear()
+    REPORTS.update({
+        1: Report(
+            artifact=ARTIFACTS[0],
+            annotations=[
+                "Annotation: Signal lag at mile 22 traced to weathered relay housing.",
+                "Annotation: Union memo corroborates staffing gaps in night shifts.",
+            ],
+            sources=["Union memo", "Maintenance log", "Dispatch interview"],
+        )
+    })
+
+    PHOTO_ESSAYS.clear()
+    PHOTO_ESSAYS.update({
+        4: PhotoEssay(
+            artifact=ARTIFACTS[3],
+            frames=[
+                "/static/images/placeholder.svg",
+                "/static/images/placeholder.svg",
+                "/static/images/placeholder.svg",
+            ],
+            captions=[
+                "Frame 01: Night signal in fog.",
+                "Frame 02: Yard crew under sodium lights.",
+                "Frame 03: Rails after rain.",
+            ],
+        )
+    })
+
+    LETTERS.clear()
+    LETTERS.update({
+        3: Letter(artifact=ARTIFACTS[2], recipient="Apprentice Signal Crew"),
+    })
+
+    ZINES.clear()
+    ZINES.update({
+        5: Zine(
+            artifact=ARTIFACTS[4],
+            spreads=[
+                "Front cover spread",
+                "Signal lore spread",
+                "Fold instructions spread",
+            ],
+            print_notes="Print on A4, fold twice, trim along the dashed line.",
+        )
+    })
+
+    ISSUES[:] = [
+        Issue(
+            name="June 2024",
+            cover_story_id=1,
+            letter=(
+                "This month we trace the overlooked labor of the night lines. "
+                "Our route map follows the patience of dispatchers, the artistry of "
+                "photojournalists, and the paper folds of our zines."
+            ),
+            routes=["Investigations", "Routes", "Letters", "Photojournalism", "Zines"],
+        )
+    ]
 
-LETTERS: Dict[int, Letter] = {
-    3: Letter(artifact=ARTIFACTS[2], recipient="Apprentice Signal Crew"),
-}
+    COLLECTIONS.clear()
+    COLLECTIONS.update({
+        "Library": Collection(
+            name="Library",
+            description="Review essays, bibliographies, and archival references.",
+            artifact_ids=[1, 2],
+        ),
+        "Gallery": Collection(
+            name="Gallery",
+            description="Curated visual storytelling from the yard.",
+            artifact_ids=[4],
+        ),
+    })
+    bump_catalog_version()
 
-ZINES: Dict[int, Zine] = {
-    5: Zine(
-        artifact=ARTIFACTS[4],
-        spreads=[
-            "Front cover spread",
-            "Signal lore spread",
-            "Fold instructions spread",
-        ],
-        print_notes="Print on A4, fold twice, trim along the dashed line.",
-    )
-}
 
-ISSUES: List[Issue] = [
-    Issue(
-        name="June 2024",
-        cover_story_id=1,
-        letter=(
-            "This month we trace the overlooked labor of the night lines. "
-            "Our route map follows the patience of dispatchers, the artistry of "
-            "photojournalists, and the paper folds of our zines."
-        ),
-        routes=["Investigations", "Routes", "Letters", "Photojournalism", "Zines"],
-    )
-]
-
-COLLECTIONS: Dict[str, Collection] = {
-    "Library": Collection(
-        name="Library",
-        description="Review essays, bibliographies, and archival references.",
-        artifact_ids=[1, 2],
-    ),
-    "Gallery": Collection(
-        name="Gallery",
-        description="Curated visual storytelling from the yard.",
-        artifact_ids=[4],
-    ),
+_catalog_lock = threading.Lock()
+_catalog_version = 0
+
+# Lookup indexes map a key to positions in ``ARTIFACTS``. Each is stored with
+# the catalog version it was built for and rebuilt on first use after that
+# version changes; a restored snapshot may supply loaders that are used
+# instead of a full scan. Readers of a current index take no lock, and a
+# missing index is built under a lock for that index alone.
+Index = Dict[object, List[int]]
+IndexLoader = Callable[[], Index]
+
+_indexes: Dict[str, Tuple[int, Index]] = {}
+_index_loaders: Dict[str, Tuple[int, IndexLoader]] = {}
+
+
+def catalog_version() -> int:
+    """Return a counter that changes whenever the catalog is edited."""
+    return _catalog_version
+
+
+def bump_catalog_version() -> int:
+    """Mark the catalog as changed so derived renders are rebuilt."""
+    global _catalog_version
+    with _catalog_lock:
+        _catalog_version += 1
+        return _catalog_version
+
+
+def _author_name(artifact: Artifact) -> str:
+    return artifact.byline.replace("By ", "")
+
+
+_INDEX_KEYS: Dict[str, Callable[[Artifact], List[object]]] = {
+    "id": lambda artifact: [artifact.id],
+    "category": lambda artifact: [artifact.category],
+    "tag": lambda artifact: artifact.tags,
+    "artifact_type": lambda artifact: [artifact.artifact_type],
+    "issue": lambda artifact: [artifact.issue],
+    "author": lambda artifact: [_author_name(artifact)],
 }
+INDEX_NAMES = tuple(_INDEX_KEYS)
+_index_locks = {name: threading.Lock() for name in INDEX_NAMES}
+
+
+def build_index(name: str) -> Index:
+    """Scan the catalog and build the named lookup index."""
+    keys_for = _INDEX_KEYS[name]
+    index: Index = {}
+    for position, artifact in enumerate(ARTIFACTS):
+        for key in keys_for(artifact):
+            positions = index.setdefault(key, [])
+            if not positions or positions[-1] != position:
+                positions.append(position)
+    return index
+
+
+def install_index_loaders(loaders: Dict[str, IndexLoader]) -> None:
+    """Register lazy loaders for the current catalog version's indexes."""
+    with _catalog_lock:
+        version = _catalog_version
+    _index_loaders.clear()
+    _index_loaders.update((name, (version, loader)) for name, loader in loaders.items())
+
+
+def _current_index(name: str, version: int) -> Optional[Index]:
+    entry = _indexes.get(name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    return None
+
+
+def _index(name: str) -> Index:
+    index = _current_index(name, _catalog_version)
+    if index is not None:
+        return index
+    with _index_locks[name]:
+        # Read the version before building: an edit made meanwhile leaves
+        # this index tagged as stale, so the next caller rebuilds it.
+        version = _catalog_version
+        index = _current_index(name, version)
+        if index is None:
+            loader = _index_loaders.pop(name, None)
+            if loader is not None and loader[0] == version:
+                index = loader[1]()
+            else:
+                index = build_index(name)
+            _indexes[name] = (version, index)
+        return index
+
+
+def warm_indexes() -> None:
+    """Build every lookup index for the current catalog version."""
+    for name in INDEX_NAMES:
+        _index(name)
+
+
+def _lookup(name: str, key: object) -> List[Artifact]:
+    return [ARTIFACTS[position] for position in _index(name).get(key, ())]
 
 
 def find_artifact(artifact_id: int) -> Optional[Artifact]:
-    return next((artifact for artifact in ARTIFACTS if artifact.id == artifact_id), None)
+    matches = _lookup("id", artifact_id)
+    return matches[0] if matches else None
 
 
 def filter_by_type(artifact_type: str) -> List[Artifact]:
-    return [artifact for artifact in ARTIFACTS if artifact.artifact_type == artifact_type]
+    return _lookup("artifact_type", artifact_type)
 
 
 def filter_by_category(category: str) -> List[Artifact]:
-    return [artifact for artifact in ARTIFACTS if artifact.category == category]
+    return _lookup("category", category)
 
 
 def filter_by_tag(tag: str) -> List[Artifact]:
-    return [artifact for artifact in ARTIFACTS if tag in artifact.tags]
+    return _lookup("tag", tag)
+
+
+def filter_by_issue(issue_name: str) -> List[Artifact]:
+    return _lookup("issue", issue_name)
+
+
+def filter_by_author(author_name: str) -> List[Artifact]:
+    return _lookup("author", author_name)
 
 
 def search_artifacts(query: str, filters: Dict[str, str]) -> List[Artifact]:
@@ -328,4 +464,4 @@ def search_artifacts(query: str, filters: Dict[str, str]) -> List[Artifact]:
 
 
 def get_authors() -> List[str]:
-    return sorted({artifact.byline.replace("By ", "") for artifact in ARTIFACTS})
+    return sorted(_index("author"))
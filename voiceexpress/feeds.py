@@ -0,0 +1,214 @@
+"""Atom and RSS feeds for categories, tags, issues and authors.
+
+Each feed is rendered once per catalog version and kept as bytes, so a
+poll costs a dictionary lookup. Absolute links are built from the
+configured ``FEEDS_BASE_URL``, never from the request's ``Host`` header,
+so clients cannot add cache entries by varying it. Feed readers keep entry
+ids for good, so without a base URL feeds are only served in debug mode,
+against ``http://localhost:5000/``.
+
+Responses carry a content-hash ETag and a Last-Modified taken from the
+newest entry. Both are identical on every worker and across restarts,
+and conditional requests are answered with 304 Not Modified.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, time, timezone
+from email.utils import format_datetime
+from typing import Callable, Dict, List
+from urllib.parse import urljoin, urlsplit
+from xml.etree import ElementTree
+
+from flask import Blueprint, Response, abort, current_app, request
+
+from .cache import VersionedCache
+from .data import (
+    CATEGORIES,
+    ISSUES,
+    TAGS,
+    Artifact,
+    filter_by_author,
+    filter_by_category,
+    filter_by_issue,
+    filter_by_tag,
+    get_authors,
+)
+from .jobs import jobs
+
+feeds_bp = Blueprint("feeds", __name__, url_prefix="/feeds")
+
+FEED_SOURCES: Dict[str, Callable[[str], List[Artifact]]] = {
+    "category": filter_by_category,
+    "tag": filter_by_tag,
+    "issue": filter_by_issue,
+    "author": filter_by_author,
+}
+
+FEED_PAGES = {
+    "category": ("public.category_page", "category"),
+    "tag": ("public.tag_page", "tag"),
+    "issue": ("public.issue", "issue_name"),
+    "author": ("public.author_page", "author_name"),
+}
+
+FEED_MIMETYPES = {
+    "atom": "application/atom+xml",
+    "rss": "application/rss+xml",
+}
+
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+
+DEBUG_BASE_URL = "http://localhost:5000/"
+
+
+@dataclass(frozen=True)
+class RenderedFeed:
+    body: bytes
+    etag: str
+    updated: datetime
+
+
+_feed_cache: VersionedCache[RenderedFeed] = VersionedCache()
+
+
+def feed_names(kind: str) -> List[str]:
+    """Return every name that has a feed of the given kind."""
+    if kind == "category":
+        return list(CATEGORIES)
+    if kind == "tag":
+        return list(TAGS)
+    if kind == "issue":
+        return [issue.name for issue in ISSUES]
+    if kind == "author":
+        return get_authors()
+    return []
+
+
+def feeds_base_url() -> str:
+    """Return the public root that feed links point at, or ``""`` if feeds are off."""
+    base_url = current_app.config["FEEDS_BASE_URL"]
+    if not base_url and (current_app.debug or current_app.testing):
+        return DEBUG_BASE_URL
+    return base_url
+
+
+@feeds_bp.app_template_global()
+def has_feed(kind: str, name: str) -> bool:
+    """Return whether ``/feeds/<kind>/<name>`` exists, for page ``<link>`` tags."""
+    return bool(feeds_base_url()) and name in feed_names(kind)
+
+
+def _published_at(artifact: Artifact) -> datetime:
+    return datetime.combine(artifact.published, time(), tzinfo=timezone.utc)
+
+
+def _external_url(endpoint: str, **values: str) -> str:
+    """Build an absolute URL under ``FEEDS_BASE_URL``, with or without a request."""
+    base = urlsplit(feeds_base_url())
+    adapter = current_app.url_map.bind(
+        base.netloc, script_name=base.path or "/", url_scheme=base.scheme
+    )
+    return adapter.build(endpoint, values, force_external=True)
+
+
+def _page_url(kind: str, name: str) -> str:
+    endpoint, argument = FEED_PAGES[kind]
+    return _external_url(endpoint, **{argument: name})
+
+
+def _feed_url(kind: str, name: str, fmt: str) -> str:
+    return _external_url("feeds.feed", kind=kind, name=name, fmt=fmt)
+
+
+def _artifact_url(artifact: Artifact) -> str:
+    return urljoin(_external_url("public.home"), f"{artifact.artifact_type}/{artifact.id}")
+
+
+def _feed_updated(artifacts: List[Artifact]) -> datetime:
+    if not artifacts:
+        return datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return max(_published_at(artifact) for artifact in artifacts)
+
+
+def _render_atom(kind: str, name: str, artifacts: List[Artifact]) -> bytes:
+    feed = ElementTree.Element("feed", xmlns=ATOM_NAMESPACE)
+    ElementTree.SubElement(feed, "title").text = f"VoiceExpress — {name}"
+    ElementTree.SubElement(feed, "id").text = _feed_url(kind, name, "atom")
+    ElementTree.SubElement(feed, "updated").text = _feed_updated(artifacts).isoformat()
+    ElementTree.SubElement(feed, "link", rel="self", href=_feed_url(kind, name, "atom"))
+    ElementTree.SubElement(feed, "link", rel="alternate", href=_page_url(kind, name))
+    for artifact in artifacts:
+        entry = ElementTree.SubElement(feed, "entry")
+        ElementTree.SubElement(entry, "title").text = artifact.title
+        ElementTree.SubElement(entry, "id").text = _artifact_url(artifact)
+        ElementTree.SubElement(entry, "link", href=_artifact_url(artifact))
+        ElementTree.SubElement(entry, "updated").text = _published_at(artifact).isoformat()
+        author = ElementTree.SubElement(entry, "author")
+        ElementTree.SubElement(author, "name").text = artifact.byline.replace("By ", "")
+        ElementTree.SubElement(entry, "summary").text = artifact.synopsis
+        ElementTree.SubElement(entry, "category", term=artifact.category)
+    return ElementTree.tostring(feed, encoding="utf-8", xml_declaration=True)
+
+
+def _render_rss(kind: str, name: str, artifacts: List[Artifact]) -> bytes:
+    rss = ElementTree.Element("rss", version="2.0")
+    channel = ElementTree.SubElement(rss, "channel")
+    ElementTree.SubElement(channel, "title").text = f"VoiceExpress — {name}"
+    ElementTree.SubElement(channel, "link").text = _page_url(kind, name)
+    ElementTree.SubElement(channel, "description").text = f"Latest {kind} dispatches: {name}"
+    ElementTree.SubElement(channel, "lastBuildDate").text = format_datetime(
+        _feed_updated(artifacts)
+    )
+    for artifact in artifacts:
+        item = ElementTree.SubElement(channel, "item")
+        ElementTree.SubElement(item, "title").text = artifact.title
+        ElementTree.SubElement(item, "link").text = _artifact_url(artifact)
+        ElementTree.SubElement(item, "guid").text = _artifact_url(artifact)
+        ElementTree.SubElement(item, "pubDate").text = format_datetime(_published_at(artifact))
+        ElementTree.SubElement(item, "description").text = artifact.synopsis
+        ElementTree.SubElement(item, "category").text = artifact.category
+    return ElementTree.tostring(rss, encoding="utf-8", xml_declaration=True)
+
+
+_RENDERERS = {"atom": _render_atom, "rss": _render_rss}
+
+
+def _rendered_feed(kind: str, name: str, fmt: str) -> RenderedFeed:
+    def render() -> RenderedFeed:
+        artifacts = sorted(
+            FEED_SOURCES[kind](name), key=lambda artifact: artifact.published, reverse=True
+        )
+        body = _RENDERERS[fmt](kind, name, artifacts)
+        return RenderedFeed(
+            body=body, etag=hashlib.sha1(body).hexdigest(), updated=_feed_updated(artifacts)
+        )
+
+    return _feed_cache.get_or_render((kind, name, fmt), render)
+
+
+@feeds_bp.route("/<kind>/<name>.atom", defaults={"fmt": "atom"})
+@feeds_bp.route("/<kind>/<name>.rss", defaults={"fmt": "rss"})
+def feed(kind: str, name: str, fmt: str) -> Response:
+    """Serve a cached Atom or RSS feed, honouring conditional requests."""
+    if not has_feed(kind, name):
+        abort(404)
+    rendered = _rendered_feed(kind, name, fmt)
+    response = Response(rendered.body, mimetype=FEED_MIMETYPES[fmt])
+    response.set_etag(rendered.etag)
+    response.last_modified = rendered.updated
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config["FEEDS_MAX_AGE"]
+    return response.make_conditional(request)
+
+
+@jobs.task("feeds.render")
+def prerender_feeds(payload) -> None:
+    """Render every feed for the current catalog ahead of the first poll."""
+    if not feeds_base_url():
+        return
+    for kind in FEED_SOURCES:
+        for name in feed_names(kind):
+            for fmt in _RENDERERS:
+                _rendered_feed(kind, name, fmt)
@@ -0,0 +1,325 @@
+"""Responsive image derivatives for photo essays and artifact images.
+
+Raster images under the static folder are resized to a fixed set of
+widths and re-encoded as WebP/AVIF (when Pillow supports them) on first
+request or when an artifact is published. Derivatives live in a
+content-addressed cache directory: the file name is a hash of the source
+bytes, width and format, so an edited source never serves a stale file.
+The cache is trimmed, least recently used first, once it grows past
+``IMAGE_CACHE_MAX_BYTES``.
+
+Pillow is optional. Without it, or for vector sources such as SVG, the
+helpers return no srcset and templates fall back to the original file.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import Blueprint, Flask, Response, abort, current_app, send_file, url_for
+from werkzeug.security import safe_join
+
+from .jobs import jobs
+from .throttle import SingleFlight
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; originals are served as-is.
+    Image = None
+    ImageOps = None
+    features = None
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow built without littlecms; profiles are dropped.
+    ImageCms = None
+
+images_bp = Blueprint("images", __name__, url_prefix="/images")
+
+RASTER_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff"}
+
+FORMAT_MIMETYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+
+# Preferred order for <picture> sources; jpeg is the universal fallback.
+FORMAT_PREFERENCE = ("avif", "webp", "jpeg")
+
+_flights = SingleFlight()
+_sources_lock = threading.Lock()
+_sources: Dict[Tuple[str, int, int], Tuple[str, int]] = {}
+# Derivatives used this recently are never evicted, so a file handed to a
+# request is still there when the response opens it.
+EVICTION_GRACE_SECONDS = 30
+
+_cache_lock = threading.Lock()
+# Bytes held by each cache directory and the earliest time a trim could free
+# anything. The total is counted on first use and then kept up to date from
+# this process's writes, so a miss only walks the directory when the cache
+# is over its limit and some derivative is old enough to evict.
+_cache_usage: Dict[str, Tuple[int, float]] = {}
+
+
+def init_images(app: Flask) -> None:
+    """Set image defaults and expose the template helpers."""
+    app.config.setdefault("IMAGE_WIDTHS", (320, 640, 960, 1280, 1920))
+    app.config.setdefault("IMAGE_CACHE_DIR", os.path.join(app.instance_path, "image-cache"))
+    app.config.setdefault("IMAGE_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+    app.config.setdefault("IMAGE_MAX_AGE", 24 * 60 * 60)
+    app.add_template_global(image_formats)
+    app.add_template_global(image_srcset)
+
+
+def supported_formats() -> List[str]:
+    """Return the derivative formats this Pillow build can encode."""
+    if Image is None:
+        return []
+    formats = []
+    for fmt in FORMAT_PREFERENCE:
+        try:
+            available = fmt == "jpeg" or features.check(fmt)
+        except ValueError:  # older Pillow releases do not know the feature
+            available = False
+        if available:
+            formats.append(fmt)
+    return formats
+
+
+def _source_path(source: str) -> Optional[str]:
+    """Map a ``/static/...`` URL to a raster file inside the static folder."""
+    static_prefix = f"{current_app.static_url_path}/"
+    if not source.startswith(static_prefix):
+        return None
+    if os.path.splitext(source)[1].lower() not in RASTER_EXTENSIONS:
+        return None
+    path = safe_join(current_app.static_folder, source[len(static_prefix):])
+    if path is None or not os.path.isfile(path):
+        return None
+    return path
+
+
+def _source_info(path: str) -> Tuple[str, int]:
+    """Return the content digest and displayed pixel width of a source image."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _sources_lock:
+        info = _sources.get(key)
+    if info is None:
+        with open(path, "rb") as handle:
+            digest = hashlib.sha256(handle.read()).hexdigest()
+        with Image.open(path) as image:
+            width = ImageOps.exif_transpose(image).width
+        info = (digest, width)
+        with _sources_lock:
+            _sources[key] = info
+    return info
+
+
+def _widths_for(path: str) -> List[int]:
+    _, source_width = _source_info(path)
+    widths = [width for width in current_app.config["IMAGE_WIDTHS"] if width < source_width]
+    return widths + [source_width]
+
+
+def image_formats(source: str) -> List[str]:
+    """Return the formats ``source`` can be served in, best first."""
+    if Image is None or _source_path(source) is None:
+        return []
+    return supported_formats()
+
+
+def _derivative_url(source: str, width: int, fmt: str) -> str:
+    return url_for("images.derivative", width=width, fmt=fmt, source=source.lstrip("/"))
+
+
+def image_srcset(source: str, fmt: str) -> str:
+    """Build a ``srcset`` value of width-bucketed derivatives of ``source``."""
+    path = _source_path(source) if Image is not None else None
+    if path is None or fmt not in supported_formats():
+        return ""
+    return ", ".join(
+        f"{_derivative_url(source, width, fmt)} {width}w" for width in _widths_for(path)
+    )
+
+
+def _derivative_path(path: str, width: int, fmt: str) -> str:
+    digest, _ = _source_info(path)
+    name = hashlib.sha256(f"{digest}:{width}:{fmt}".encode()).hexdigest()
+    return os.path.join(current_app.config["IMAGE_CACHE_DIR"], name[:2], f"{name}.{fmt}")
+
+
+def _output_mode(image: "Image.Image", fmt: str) -> str:
+    """Return the pixel mode ``fmt`` will be encoded in."""
+    if fmt == "jpeg":
+        return "L" if image.mode == "L" else "RGB"
+    if image.mode in {"RGBA", "LA", "PA"} or "transparency" in image.info:
+        return "RGBA"
+    return "RGB"
+
+
+def _to_srgb(image: "Image.Image", icc_profile: bytes, mode: str) -> "Image.Image":
+    """Convert ``image`` from its embedded profile to sRGB pixels in ``mode``."""
+    if ImageCms is not None:
+        try:
+            return ImageCms.profileToProfile(
+                image,
+                ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)),
+                ImageCms.createProfile("sRGB"),
+                outputMode=mode,
+            )
+        except (ImageCms.PyCMSError, ValueError):  # unusable profile or mode
+            pass
+    return image.convert(mode)
+
+
+def _render_derivative(path: str, width: int, fmt: str, target: str) -> None:
+    with Image.open(path) as source:
+        icc_profile = source.info.get("icc_profile")
+        # Bake the EXIF orientation into the pixels; the derivative's
+        # metadata is not copied, so browsers would not rotate it.
+        image = ImageOps.exif_transpose(source)
+        if image.width > width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        mode = _output_mode(image, fmt)
+        if image.mode != mode:
+            # The source profile describes the source's colour space, so it
+            # cannot travel with converted pixels: convert to sRGB and let
+            # browsers assume sRGB for the untagged result.
+            if icc_profile:
+                image = _to_srgb(image, icc_profile, mode)
+                icc_profile = None
+            else:
+                image = image.convert(mode)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_target = f"{target}.{threading.get_ident()}.tmp"
+        try:
+            image.save(tmp_target, format=fmt.upper(), quality=80, icc_profile=icc_profile)
+            os.replace(tmp_target, target)
+        finally:
+            # Only left behind by a failed encode; _scan never evicts .tmp files.
+            if os.path.exists(tmp_target):
+                os.remove(tmp_target)
+
+
+def _scan(cache_dir: str) -> Tuple[int, List[Tuple[float, int, str]]]:
+    """Return the cache's total size and its derivatives as ``(mtime, size, path)``."""
+    total = 0
+    entries = []
+    for root, _, files in os.walk(cache_dir):
+        for filename in files:
+            filepath = os.path.join(root, filename)
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            if not filename.endswith(".tmp"):
+                entries.append((stat.st_mtime, stat.st_size, filepath))
+    return total, entries
+
+
+def _record_write(cache_dir: str, max_bytes: int, written: str) -> None:
+    """Account for a new derivative and trim the cache if it is now too large.
+
+    Least recently used derivatives are deleted first, sparing any used
+    within ``EVICTION_GRACE_SECONDS``.
+    """
+    now = time.time()
+    with _cache_lock:
+        usage = _cache_usage.get(cache_dir)
+        if usage is None:
+            total, _ = _scan(cache_dir)
+            trim_after = now
+        else:
+            total, trim_after = usage
+            try:
+                total += os.path.getsize(written)
+            except FileNotFoundError:
+                pass
+        if total > max_bytes and now >= trim_after:
+            # Re-walk rather than trust the running total: other workers
+            # share the directory and may have added or removed files.
+            total, entries = _scan(cache_dir)
+            cutoff = now - EVICTION_GRACE_SECONDS
+            for used, size, filepath in sorted(entries):
+                if total <= max_bytes:
+                    break
+                if used > cutoff:
+                    trim_after = used + EVICTION_GRACE_SECONDS
+                    break
+                try:
+                    os.remove(filepath)
+                except FileNotFoundError:
+                    pass
+                total -= size
+        _cache_usage[cache_dir] = (total, trim_after)
+
+
+def ensure_derivative(source: str, width: int, fmt: str) -> Optional[str]:
+    """Return the cached derivative file, generating it if needed."""
+    path = _source_path(source) if Image is not None else None
+    if path is None or fmt not in supported_formats() or width not in _widths_for(path):
+        return None
+    target = _derivative_path(path, width, fmt)
+    try:
+        os.utime(target)
+        return target
+    except FileNotFoundError:  # never generated, or evicted since
+        pass
+
+    def generate() -> str:
+        if not os.path.exists(target):
+            _render_derivative(path, width, fmt, target)
+            _record_write(
+                current_app.config["IMAGE_CACHE_DIR"],
+                current_app.config["IMAGE_CACHE_MAX_BYTES"],
+                written=target,
+            )
+        return target
+
+    return _flights.do(target, generate)
+
+
+def _send_derivative(target: str, fmt: str) -> Response:
+    return send_file(
+        target,
+        mimetype=FORMAT_MIMETYPES[fmt],
+        conditional=True,
+        max_age=current_app.config["IMAGE_MAX_AGE"],
+    )
+
+
+@images_bp.route("/<int:width>/<fmt>/<path:source>")
+def derivative(width: int, fmt: str, source: str) -> Response:
+    """Serve a resized, re-encoded copy of a static image."""
+    target = ensure_derivative(f"/{source}", width, fmt)
+    if target is None:
+        abort(404)
+    try:
+        return _send_derivative(target, fmt)
+    except FileNotFoundError:
+        # Evicted by another request between lookup and open; regenerate,
+        # unless the source itself has gone.
+        target = ensure_derivative(f"/{source}", width, fmt)
+        if target is None:
+            abort(404)
+        return _send_derivative(target, fmt)
+
+
+@jobs.task("images.derive")
+def derive_images(payload) -> None:
+    """Pre-generate every derivative of the published images."""
+    for source in payload["sources"]:
+        path = _source_path(source) if Image is not None else None
+        if path is None:
+            continue
+        for width in _widths_for(path):
+            for fmt in supported_formats():
+                ensure_derivative(source, width, fmt)
@@ -0,0 +1,273 @@
+"""In-process background jobs for work derived from catalog edits.
+
+Publishing only records the edit; anything that can be rebuilt from the
+catalog (indexes, snapshots, feeds, image derivatives) is queued here and
+run on a small thread pool outside the request.
+
+Jobs are persisted in a local SQLite queue so work queued before a worker
+restart is resumed on the next boot. A job is identified by its handler
+name and a coalescing key: enqueueing a job that is already waiting to run
+returns the waiting job instead of adding a duplicate.
+
+Several worker processes may share one ``JOBS_DATABASE``, but handlers
+rebuild state held in the enqueuing process's memory, so a job belongs to
+the worker that queued it and only that worker runs it. Each job carries a
+lease of ``JOBS_LEASE_SECONDS``, taken when it is queued and renewed when
+it starts or is retried. A booting worker adopts only jobs whose lease has
+expired, because the worker that owned them has gone. Handlers should
+finish well within the lease, or another worker may run the job again.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional
+
+from flask import Flask
+
+Handler = Callable[[Dict[str, object]], None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT NOT NULL DEFAULT '',
+    enqueued_at REAL NOT NULL,
+    run_after REAL NOT NULL DEFAULT 0,
+    owner TEXT NOT NULL DEFAULT '',
+    lease_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+_COLUMNS_ADDED_LATER = {
+    "run_after": "REAL NOT NULL DEFAULT 0",
+    "owner": "TEXT NOT NULL DEFAULT ''",
+    "lease_until": "REAL NOT NULL DEFAULT 0",
+}
+
+
+@dataclass
+class JobMetrics:
+    enqueued: int = 0
+    coalesced: int = 0
+    succeeded: int = 0
+    retried: int = 0
+    failed: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_error: str = ""
+
+
+class JobQueue:
+    """A persistent queue drained by a bounded thread pool."""
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, Handler] = {}
+        self._lock = threading.Lock()
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._metrics: Dict[str, JobMetrics] = {}
+        self._app: Optional[Flask] = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_attempts = 3
+        self._retry_delay = 1.0
+        self._lease_seconds = 300.0
+
+    def task(self, name: str) -> Callable[[Handler], Handler]:
+        """Register the decorated function as the handler for ``name``."""
+
+        def decorator(handler: Handler) -> Handler:
+            self._handlers[name] = handler
+            return handler
+
+        return decorator
+
+    def init_app(self, app: Flask) -> None:
+        """Open the queue for ``app`` and resume jobs left from a previous run."""
+        app.config.setdefault("JOBS_DATABASE", os.path.join(app.instance_path, "jobs.sqlite3"))
+        app.config.setdefault("JOBS_MAX_WORKERS", 2)
+        app.config.setdefault("JOBS_MAX_ATTEMPTS", 3)
+        app.config.setdefault("JOBS_RETRY_DELAY", 1.0)
+        app.config.setdefault("JOBS_LEASE_SECONDS", 300.0)
+
+        os.makedirs(os.path.dirname(app.config["JOBS_DATABASE"]), exist_ok=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+            self._app = app
+            self._max_attempts = app.config["JOBS_MAX_ATTEMPTS"]
+            self._retry_delay = app.config["JOBS_RETRY_DELAY"]
+            self._lease_seconds = app.config["JOBS_LEASE_SECONDS"]
+            self._db = sqlite3.connect(
+                app.config["JOBS_DATABASE"],
+                check_same_thread=False,
+                isolation_level=None,
+                timeout=30,
+            )
+            self._db.execute(_SCHEMA)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            for column, definition in _COLUMNS_ADDED_LATER.items():
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            now = time.time()
+            self._db.execute(
+                "UPDATE jobs SET status = 'queued', owner = ?, lease_until = ? "
+                "WHERE status IN ('queued', 'running') AND lease_until < ?",
+                (self._owner, now + self._lease_seconds, now),
+            )
+            self._executor = ThreadPoolExecutor(
+                max_workers=app.config["JOBS_MAX_WORKERS"], thread_name_prefix="voiceexpress-job"
+            )
+            resumed = self._db.execute(
+                "SELECT id, run_after FROM jobs WHERE status = 'queued' AND owner = ? ORDER BY id",
+                (self._owner,),
+            ).fetchall()
+        app.extensions["voiceexpress.jobs"] = self
+        for job_id, run_after in resumed:
+            self._submit(job_id, delay=max(0.0, run_after - now))
+
+    def enqueue(self, name: str, key: str = "", payload: Optional[Dict[str, object]] = None) -> int:
+        """Queue ``name`` to run in the background and return its job id."""
+        if name not in self._handlers:
+            raise KeyError(f"No background job registered as {name!r}.")
+        with self._lock:
+            if self._db is None:
+                raise RuntimeError("JobQueue.init_app() has not been called.")
+            metrics = self._metrics.setdefault(name, JobMetrics())
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                waiting = self._db.execute(
+                    "SELECT id FROM jobs "
+                    "WHERE name = ? AND key = ? AND status = 'queued' AND owner = ?",
+                    (name, key, self._owner),
+                ).fetchone()
+                if waiting is None:
+                    now = time.time()
+                    job_id = self._db.execute(
+                        "INSERT INTO jobs (name, key, payload, status, enqueued_at, owner, "
+                        "lease_until) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                        (
+                            name,
+                            key,
+                            json.dumps(payload or {}),
+                            now,
+                            self._owner,
+                            now + self._lease_seconds,
+                        ),
+                    ).lastrowid
+            finally:
+                self._db.execute("COMMIT")
+            if waiting is not None:
+                metrics.coalesced += 1
+                return waiting[0]
+            metrics.enqueued += 1
+        self._submit(job_id)
+        return job_id
+
+    def metrics(self) -> Dict[str, object]:
+        """Return per-job counters plus the current queue depth."""
+        with self._lock:
+            depth: Dict[str, int] = {}
+            if self._db is not None:
+                depth.update(
+                    self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+                )
+            return {
+                "queue": depth,
+                "jobs": {name: asdict(metrics) for name, metrics in self._metrics.items()},
+            }
+
+    def _submit(self, job_id: int, delay: float = 0.0) -> None:
+        if delay:
+            timer = threading.Timer(delay, self._submit, args=(job_id,))
+            timer.daemon = True
+            timer.start()
+            return
+        if self._executor is not None:
+            self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: int) -> None:
+        with self._lock:
+            now = time.time()
+            claimed = self._db.execute(
+                "UPDATE jobs SET status = 'running', lease_until = ? "
+                "WHERE id = ? AND status = 'queued' AND owner = ? AND run_after <= ?",
+                (now + self._lease_seconds, job_id, self._owner, now),
+            ).rowcount
+            if not claimed:
+                due = self._db.execute(
+                    "SELECT run_after FROM jobs WHERE id = ? AND status = 'queued' AND owner = ?",
+                    (job_id, self._owner),
+                ).fetchone()
+                if due is not None and due[0] > now:
+                    self._submit(job_id, delay=due[0] - now)
+                return
+            name, payload, attempts = self._db.execute(
+                "SELECT name, payload, attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            metrics = self._metrics.setdefault(name, JobMetrics())
+            handler = self._handlers.get(name)
+
+        started = time.perf_counter()
+        error = ""
+        try:
+            if handler is None:
+                raise KeyError(f"No background job registered as {name!r}.")
+            with self._app.app_context():
+                handler(json.loads(payload))
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        elapsed = time.perf_counter() - started
+
+        retry_in = 0.0
+        with self._lock:
+            metrics.total_seconds += elapsed
+            metrics.max_seconds = max(metrics.max_seconds, elapsed)
+            if not error:
+                metrics.succeeded += 1
+                self._db.execute(
+                    "DELETE FROM jobs WHERE id = ? AND owner = ?", (job_id, self._owner)
+                )
+                return
+            attempts += 1
+            metrics.last_error = error
+            if handler is not None and attempts < self._max_attempts:
+                metrics.retried += 1
+                retry_in = self._retry_delay * 2 ** (attempts - 1)
+                run_after = time.time() + retry_in
+                self._db.execute(
+                    "UPDATE jobs SET status = 'queued', attempts = ?, last_error = ?, "
+                    "run_after = ?, lease_until = ? WHERE id = ? AND owner = ?",
+                    (
+                        attempts,
+                        error,
+                        run_after,
+                        run_after + self._lease_seconds,
+                        job_id,
+                        self._owner,
+                    ),
+                )
+            else:
+                metrics.failed += 1
+                self._db.execute(
+                    "UPDATE jobs SET status = 'failed', owner = '', attempts = ?, "
+                    "last_error = ? WHERE id = ? AND owner = ?",
+                    (attempts, error, job_id, self._owner),
+                )
+        if retry_in:
+            self._submit(job_id, delay=retry_in)
+
+
+jobs = JobQueue()
@@ -18,23 +18,30 @@ from .data import (
     USERS,
     ZINES,
     filter_by_category,
+    filter_by_issue,
     filter_by_tag,
     find_artifact,
     get_authors,
     search_artifacts,
 )
+from .throttle import admission_controlled, single_flight
 
 public_bp = Blueprint("public", __name__)
 
 
-@public_bp.context_processor
+@public_bp.app_context_processor
 def inject_globals() -> Dict[str, object]:
-    """Inject shared navigation data for templates."""
+    """Inject shared navigation data for templates.
+
+    Registered app-wide because every blueprint renders ``base.html`` and its
+    cached sidebars must not be filled from a page that lacks this data.
+    ``authors`` is passed uncalled so only a sidebar cache miss pays for it.
+    """
     return {
         "categories": CATEGORIES,
         "tags": TAGS,
         "issues": ISSUES,
-        "authors": get_authors(),
+        "authors": get_authors,
         "current_user": session.get("user"),
     }
 
@@ -58,7 +65,7 @@ def home() -> str:
 def issue(issue_name: str) -> str:
     """Render a monthly issue page with curated routes."""
     issue_data = next((issue for issue in ISSUES if issue.name == issue_name), ISSUES[0])
-    issue_artifacts = [artifact for artifact in ARTIFACTS if artifact.issue == issue_data.name]
+    issue_artifacts = filter_by_issue(issue_data.name)
     return render_template("issue.html", issue=issue_data, artifacts=issue_artifacts)
 
 
@@ -158,6 +165,7 @@ def timeline_page() -> str:
 
 
 @public_bp.route("/search")
+@admission_controlled
 def search_page() -> str:
     """Render advanced search page and results."""
     query = request.args.get("q", "")
@@ -166,7 +174,14 @@ def search_page() -> str:
         "location": request.args.get("location", ""),
         "artifact_type": request.args.get("type", ""),
     }
-    results = search_artifacts(query, filters) if query else []
+    results = (
+        single_flight(
+            ("search", query, tuple(sorted(filters.items()))),
+            lambda: search_artifacts(query, filters),
+        )
+        if query
+        else []
+    )
     return render_template("search.html", query=query, filters=filters, results=results)
 
 
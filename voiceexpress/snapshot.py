@@ -0,0 +1,245 @@
+"""Binary catalog snapshots for fast worker start-up.
+
+A snapshot is one file holding the catalog as compact tuples plus every
+prebuilt lookup index, each pickled into its own section::
+
+    header  magic, format version, table-of-contents length
+    toc     pickled {section name: (offset, length)}
+    body    the pickled sections
+
+Loading maps the file, unpickles the catalog, and leaves each index as a
+lazy loader over the mapped bytes so an index is only decoded once a
+request needs it.
+
+Write a snapshot of the built-in catalog with
+``python -m voiceexpress.snapshot PATH``.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+from dataclasses import fields
+from datetime import date
+from typing import Dict, Tuple
+
+from . import data
+from .data import (
+    ARTIFACTS,
+    CATEGORIES,
+    COLLECTIONS,
+    ISSUES,
+    LETTERS,
+    PHOTO_ESSAYS,
+    REPORTS,
+    TAGS,
+    ZINES,
+    Artifact,
+    Citation,
+    Collection,
+    Issue,
+    Letter,
+    PhotoEssay,
+    Report,
+    Zine,
+)
+
+MAGIC = b"VESNAP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<6sHI")
+
+# Serialises writers in this process; the unique temp file keeps writers in
+# other processes from truncating each other's output.
+_write_lock = threading.Lock()
+
+ARTIFACT_FIELDS = tuple(field.name for field in fields(Artifact))
+
+
+def _artifact_record(artifact: Artifact) -> Tuple[object, ...]:
+    record = []
+    for name in ARTIFACT_FIELDS:
+        value = getattr(artifact, name)
+        if name == "published":
+            value = value.toordinal()
+        elif name == "citations":
+            value = tuple((citation.label, citation.source, citation.url) for citation in value)
+        elif name == "tags":
+            value = tuple(value)
+        record.append(value)
+    return tuple(record)
+
+
+_PUBLISHED = ARTIFACT_FIELDS.index("published")
+_CITATIONS = ARTIFACT_FIELDS.index("citations")
+_TAGS = ARTIFACT_FIELDS.index("tags")
+
+
+def _artifact_from_record(record: Tuple[object, ...]) -> Artifact:
+    # Positional construction; building a keyword dict per record roughly
+    # doubled restore time on large catalogs.
+    values = list(record)
+    values[_PUBLISHED] = date.fromordinal(values[_PUBLISHED])
+    values[_CITATIONS] = [Citation(*citation) for citation in values[_CITATIONS]]
+    values[_TAGS] = list(values[_TAGS])
+    return Artifact(*values)
+
+
+def _catalog_records() -> Dict[str, object]:
+    return {
+        "fields": ARTIFACT_FIELDS,
+        "artifacts": tuple(_artifact_record(artifact) for artifact in ARTIFACTS),
+        "categories": tuple(CATEGORIES),
+        "tags": tuple(TAGS),
+        "issues": tuple(
+            (issue.name, issue.cover_story_id, issue.letter, tuple(issue.routes))
+            for issue in ISSUES
+        ),
+        "collections": tuple(
+            (collection.name, collection.description, tuple(collection.artifact_ids))
+            for collection in COLLECTIONS.values()
+        ),
+        "reports": tuple(
+            (artifact_id, tuple(report.annotations), tuple(report.sources))
+            for artifact_id, report in REPORTS.items()
+        ),
+        "photo_essays": tuple(
+            (artifact_id, tuple(essay.frames), tuple(essay.captions))
+            for artifact_id, essay in PHOTO_ESSAYS.items()
+        ),
+        "letters": tuple(
+            (artifact_id, letter.recipient) for artifact_id, letter in LETTERS.items()
+        ),
+        "zines": tuple(
+            (artifact_id, tuple(zine.spreads), zine.print_notes)
+            for artifact_id, zine in ZINES.items()
+        ),
+    }
+
+
+def _restore_catalog(records: Dict[str, object]) -> None:
+    if tuple(records["fields"]) != ARTIFACT_FIELDS:
+        raise ValueError("Snapshot was written for a different Artifact layout.")
+
+    artifacts = [_artifact_from_record(record) for record in records["artifacts"]]
+    by_id = {artifact.id: artifact for artifact in artifacts}
+
+    ARTIFACTS[:] = artifacts
+    CATEGORIES[:] = records["categories"]
+    TAGS[:] = records["tags"]
+    ISSUES[:] = [
+        Issue(name=name, cover_story_id=cover_story_id, letter=letter, routes=list(routes))
+        for name, cover_story_id, letter, routes in records["issues"]
+    ]
+    COLLECTIONS.clear()
+    COLLECTIONS.update(
+        (name, Collection(name=name, description=description, artifact_ids=list(artifact_ids)))
+        for name, description, artifact_ids in records["collections"]
+    )
+    REPORTS.clear()
+    REPORTS.update(
+        (artifact_id, Report(by_id[artifact_id], list(annotations), list(sources)))
+        for artifact_id, annotations, sources in records["reports"]
+    )
+    PHOTO_ESSAYS.clear()
+    PHOTO_ESSAYS.update(
+        (artifact_id, PhotoEssay(by_id[artifact_id], list(frames), list(captions)))
+        for artifact_id, frames, captions in records["photo_essays"]
+    )
+    LETTERS.clear()
+    LETTERS.update(
+        (artifact_id, Letter(by_id[artifact_id], recipient))
+        for artifact_id, recipient in records["letters"]
+    )
+    ZINES.clear()
+    ZINES.update(
+        (artifact_id, Zine(by_id[artifact_id], list(spreads), print_notes))
+        for artifact_id, spreads, print_notes in records["zines"]
+    )
+
+
+def write_snapshot(path: str) -> None:
+    """Write the current catalog and all of its indexes to ``path``.
+
+    The file is replaced atomically, so readers see the old snapshot or the
+    new one, never a partial write.
+    """
+    with _write_lock:
+        _write_snapshot(path)
+
+
+def _write_snapshot(path: str) -> None:
+    sections = {"catalog": pickle.dumps(_catalog_records(), protocol=pickle.HIGHEST_PROTOCOL)}
+    for name in data.INDEX_NAMES:
+        sections[f"index:{name}"] = pickle.dumps(
+            data.build_index(name), protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    toc: Dict[str, Tuple[int, int]] = {}
+    offset = 0
+    for name, blob in sections.items():
+        toc[name] = (offset, len(blob))
+        offset += len(blob)
+    toc_blob = pickle.dumps(toc, protocol=pickle.HIGHEST_PROTOCOL)
+
+    directory, filename = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{filename}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(toc_blob)))
+            handle.write(toc_blob)
+            for blob in sections.values():
+                handle.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def load_snapshot(path: str) -> None:
+    """Replace the in-memory catalog with the snapshot stored at ``path``.
+
+    Raises ``ValueError`` if the file is not a snapshot this build can read.
+    """
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < _HEADER.size:
+        raise ValueError(f"{path} is too short to be a catalog snapshot.")
+    magic, version, toc_length = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a catalog snapshot.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {version}.")
+
+    body_start = _HEADER.size + toc_length
+    toc = pickle.loads(mapped[_HEADER.size:body_start])
+
+    def section(name: str):
+        offset, length = toc[name]
+        start = body_start + offset
+        return pickle.loads(mapped[start:start + length])
+
+    _restore_catalog(section("catalog"))
+    data.bump_catalog_version()
+    data.install_index_loaders(
+        {
+            name: (lambda name=name: section(f"index:{name}"))
+            for name in data.INDEX_NAMES
+            if f"index:{name}" in toc
+        }
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m voiceexpress.snapshot PATH")
+    if not ARTIFACTS:
+        data.seed_catalog()
+    write_snapshot(sys.argv[1])
@@ -0,0 +1,181 @@
+"""Request coalescing and admission control for expensive endpoints.
+
+Two mechanisms, each enabled per blueprint through the app config:
+
+``SINGLE_FLIGHT``
+    Blueprint names whose views share in-flight computations. Concurrent
+    callers of :func:`single_flight` with the same key wait for the first
+    caller's result instead of repeating the work.
+
+``ADMISSION_LIMITS``
+    ``{blueprint: {"rate": tokens per second, "burst": bucket size}}``.
+    Views decorated with :func:`admission_controlled` take one token from
+    the calling client's bucket and are answered with ``429`` and a
+    ``Retry-After`` header when it is empty. ``rate`` must be positive and
+    ``burst`` at least 1.
+
+    Buckets live in each worker process, so the limits apply per worker:
+    with N workers a client may get up to N times ``rate``, depending on
+    which workers its requests reach. Divide the configured values by the
+    worker count, or enforce the limit at the proxy, when that matters.
+
+    Clients are identified by ``request.remote_addr``. Behind a reverse
+    proxy that is the proxy's address, so every client would share one
+    bucket: wrap the app in ``werkzeug.middleware.proxy_fix.ProxyFix``, or
+    give the blueprint a ``"client_key"`` callable that returns the key
+    for the current request.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from flask import Flask, Response, current_app, request
+
+T = TypeVar("T")
+
+_ADMISSION_ATTRIBUTE = "_admission_controlled"
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: object = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class TokenBucket:
+    """A refilling bucket of request tokens for one client."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token, returning 0 or the seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionControl:
+    """Per-client token buckets applied to decorated views."""
+
+    max_clients = 10000
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def init_app(self, app: Flask) -> None:
+        app.config.setdefault("SINGLE_FLIGHT", set())
+        app.config.setdefault("ADMISSION_LIMITS", {})
+        for blueprint, limits in app.config["ADMISSION_LIMITS"].items():
+            if not limits:
+                continue
+            if limits["rate"] <= 0:
+                raise ValueError(f"ADMISSION_LIMITS[{blueprint!r}]['rate'] must be positive.")
+            if limits["burst"] < 1:
+                raise ValueError(f"ADMISSION_LIMITS[{blueprint!r}]['burst'] must be at least 1.")
+        app.before_request(self._admit)
+
+    def _admit(self) -> Optional[Response]:
+        view = current_app.view_functions.get(request.endpoint)
+        if not getattr(view, _ADMISSION_ATTRIBUTE, False):
+            return None
+        limits = current_app.config["ADMISSION_LIMITS"].get(request.blueprint)
+        if not limits:
+            return None
+        client_key = limits.get("client_key", _remote_addr)
+        key = (request.blueprint, client_key())
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._evict_full_buckets()
+                bucket = self._buckets[key] = TokenBucket(limits["rate"], limits["burst"])
+            wait = bucket.take()
+        if not wait:
+            return None
+        response = Response("Too many requests", status=429)
+        response.headers["Retry-After"] = str(math.ceil(wait))
+        return response
+
+    def _evict_full_buckets(self) -> None:
+        now = time.monotonic()
+        idle = [
+            key
+            for key, bucket in self._buckets.items()
+            if bucket.tokens + (now - bucket.updated) * bucket.rate >= bucket.burst
+        ]
+        if not idle:
+            # Drop the least recently used half. Clients still being
+            # throttled keep calling take(), so their buckets survive a
+            # flood of new addresses.
+            by_use = sorted(self._buckets, key=lambda key: self._buckets[key].updated)
+            idle = by_use[: len(self._buckets) // 2]
+        for key in idle:
+            del self._buckets[key]
+
+
+def _remote_addr() -> str:
+    return request.remote_addr or ""
+
+
+_flights = SingleFlight()
+admission = AdmissionControl()
+
+
+def admission_controlled(view: Callable[..., T]) -> Callable[..., T]:
+    """Mark a view as subject to its blueprint's ``ADMISSION_LIMITS``."""
+    setattr(view, _ADMISSION_ATTRIBUTE, True)
+    return view
+
+
+def single_flight(key: Hashable, compute: Callable[[], T]) -> T:
+    """Run ``compute`` once for all concurrent requests sharing ``key``.
+
+    Falls back to calling ``compute`` directly when the current blueprint
+    is not listed in ``SINGLE_FLIGHT``.
+    """
+    if request.blueprint not in current_app.config["SINGLE_FLIGHT"]:
+        return compute()
+    return _flights.do((request.blueprint, key), compute)